@@ -0,0 +1,28 @@
+import httpx
+
+BASE_URL = "http://localhost:8000"
+
+
+def make_client():
+    # Requests share pooled keep-alive connections
+    return httpx.AsyncClient(
+        base_url=BASE_URL,
+        timeout=5.0,
+        limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=30),
+    )
+
+
+async def create_fixture_user(client):
+    user_data = {
+        "name": "Test User",
+        "email": "test@example.com",
+        "age": 25,
+        "is_active": True,
+    }
+    response = await client.post(
+        "/users",
+        json=user_data,
+        headers={"Content-Type": "application/json"},
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
@@ -0,0 +1,23 @@
+import pytest
+
+from api_client import create_fixture_user, make_client
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+async def client(anyio_backend):
+    # One keep-alive connection pool shared by the whole test session
+    async with make_client() as c:
+        yield c
+
+
+@pytest.fixture(scope="session")
+async def user_id(client):
+    uid = await create_fixture_user(client)
+    yield uid
+    # Teardown: delete the user after tests
+    await client.delete(f"/users/{uid}")
@@ -0,0 +1,128 @@
+"""Redis response cache for the read-only endpoints of web_server_enhanced.py.
+
+Only imported when REDIS_URL is set, so the redis package stays optional.
+"""
+
+from fastapi import Request
+from fastapi.responses import Response
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from starlette.middleware.base import BaseHTTPMiddleware
+from typing import Dict, Optional
+import hashlib
+import logging
+import orjson
+import time
+
+logger = logging.getLogger(__name__)
+
+# Response cache policies, in seconds
+CACHE_TTL_SHORT = 5
+CACHE_TTL_NORMAL = 15
+# Expired entries are kept this long to serve if Redis or a handler fails
+CACHE_STALE_GRACE = 300
+CACHE_KEY_PREFIX = "lpl-mcp:cache:"
+# Bumped on every successful user write so cached user data is bypassed
+CACHE_GENERATION_KEY = CACHE_KEY_PREFIX + "users-generation"
+
+
+def cache_ttl(path: str) -> Optional[int]:
+    """Cache TTL for a read-only endpoint, or None if it is not cached"""
+    # /health is left out: its pre-encoded body is cheaper than two Redis
+    # round trips
+    if path == "/users" or path.startswith("/users/"):
+        return CACHE_TTL_SHORT
+    if path == "/analytics":
+        return CACHE_TTL_NORMAL
+    return None
+
+
+async def bump_generation(client: Redis):
+    """Make every cached user-data entry unreachable"""
+    try:
+        await client.incr(CACHE_GENERATION_KEY)
+    except RedisError as exc:
+        logger.warning(f"Cache invalidation failed: {exc}")
+
+
+def cached_response(entry: Dict[bytes, bytes]) -> Response:
+    return Response(
+        content=entry[b"body"],
+        status_code=int(entry[b"status"]),
+        headers=orjson.loads(entry[b"headers"]),
+    )
+
+
+class RedisCacheMiddleware(BaseHTTPMiddleware):
+    """Cache GET responses in Redis, falling back to stale entries on errors"""
+
+    def __init__(self, app, client: Redis):
+        super().__init__(app)
+        self.client = client
+
+    async def dispatch(self, request: Request, call_next):
+        path = request.url.path
+        if request.method != "GET":
+            response = await call_next(request)
+            if path.startswith("/users") and response.status_code < 400:
+                await bump_generation(self.client)
+            return response
+
+        # Conditional requests go to the handler, which can answer 304
+        ttl = cache_ttl(path)
+        if ttl is None or "if-none-match" in request.headers:
+            return await call_next(request)
+
+        try:
+            generation = await self.client.get(CACHE_GENERATION_KEY) or b"0"
+            key = CACHE_KEY_PREFIX + hashlib.sha256(
+                b"|".join(
+                    (
+                        request.method.encode(),
+                        path.encode(),
+                        request.url.query.encode(),
+                        request.headers.get("authorization", "").encode(),
+                        generation,
+                    )
+                )
+            ).hexdigest()
+            entry = await self.client.hgetall(key)
+        except RedisError as exc:
+            logger.warning(f"Cache lookup failed: {exc}")
+            return await call_next(request)
+
+        if entry and float(entry[b"stale_at"]) > time.time():
+            return cached_response(entry)
+
+        started = time.perf_counter()
+        try:
+            response = await call_next(request)
+        except Exception:
+            if entry:
+                return cached_response(entry)
+            raise
+        if response.status_code >= 500 and entry:
+            return cached_response(entry)
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        headers = dict(response.headers)
+        if response.status_code == 200:
+            # Slow-to-build responses stay fresh for correspondingly longer
+            ttl += time.perf_counter() - started
+            try:
+                await self.client.hset(
+                    key,
+                    mapping={
+                        "body": body,
+                        "status": response.status_code,
+                        "headers": orjson.dumps(headers),
+                        "stale_at": time.time() + ttl,
+                    },
+                )
+                await self.client.expire(key, int(ttl) + CACHE_STALE_GRACE)
+            except RedisError as exc:
+                logger.warning(f"Cache store failed: {exc}")
+
+        return Response(
+            content=body, status_code=response.status_code, headers=headers
+        )
@@ -0,0 +1,142 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("redis")
+
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from redis.exceptions import RedisError
+
+import redis_cache
+from redis_cache import CACHE_GENERATION_KEY, RedisCacheMiddleware, bump_generation
+
+
+class FakeRedis:
+    """In-memory stand-in for the few redis.asyncio calls the cache makes"""
+
+    def __init__(self):
+        self.data = {}
+        self.down = False
+
+    def check(self):
+        if self.down:
+            raise RedisError("connection refused")
+
+    async def get(self, key):
+        self.check()
+        return self.data.get(key)
+
+    async def incr(self, key):
+        self.check()
+        value = int(self.data.get(key, b"0")) + 1
+        self.data[key] = str(value).encode()
+        return value
+
+    async def hgetall(self, key):
+        self.check()
+        return dict(self.data.get(key, {}))
+
+    async def hset(self, key, mapping):
+        self.check()
+        self.data[key] = {
+            name.encode(): value if isinstance(value, bytes) else str(value).encode()
+            for name, value in mapping.items()
+        }
+
+    async def expire(self, key, seconds):
+        self.check()
+
+
+def make_app(fake):
+    app = FastAPI()
+    app.state.calls = 0
+    app.state.fail = None
+
+    @app.get("/users")
+    async def get_users():
+        app.state.calls += 1
+        if app.state.fail == "raise":
+            raise RuntimeError("handler failed")
+        if app.state.fail == "5xx":
+            raise HTTPException(status_code=503)
+        return {"calls": app.state.calls}
+
+    @app.post("/users")
+    async def create_user():
+        return {}
+
+    app.add_middleware(RedisCacheMiddleware, client=fake)
+    return app
+
+
+@pytest.fixture
+def fake():
+    return FakeRedis()
+
+
+@pytest.fixture
+def app(fake):
+    return make_app(fake)
+
+
+@pytest.fixture
+def client(app):
+    return TestClient(app, raise_server_exceptions=False)
+
+
+def expire_entries(monkeypatch):
+    # Every cached entry is past its fresh window but within the stale grace
+    now = redis_cache.time.time()
+    monkeypatch.setattr(redis_cache.time, "time", lambda: now + 60)
+
+
+def test_cache_hit(client, app):
+    assert client.get("/users").json() == {"calls": 1}
+    assert client.get("/users").json() == {"calls": 1}
+    assert app.state.calls == 1
+
+
+def test_write_bumps_generation(client, app, fake):
+    client.get("/users")
+    assert client.post("/users").status_code == 200
+    assert fake.data[CACHE_GENERATION_KEY] == b"1"
+    # The entry cached under the old generation is no longer reachable
+    assert client.get("/users").json() == {"calls": 2}
+
+
+def test_startup_bump_hides_previous_process_entries(client, app, fake):
+    client.get("/users")
+    # What lifespan does when a new process starts with an empty users_db
+    asyncio.run(bump_generation(fake))
+    assert client.get("/users").json() == {"calls": 2}
+
+
+@pytest.mark.parametrize("failure", ["raise", "5xx"])
+def test_stale_entry_served_on_handler_failure(client, app, monkeypatch, failure):
+    client.get("/users")
+    expire_entries(monkeypatch)
+    app.state.fail = failure
+
+    response = client.get("/users")
+    assert response.status_code == 200
+    assert response.json() == {"calls": 1}
+    assert app.state.calls == 2
+
+
+def test_handler_failure_without_entry_is_not_masked(client, app):
+    app.state.fail = "5xx"
+    assert client.get("/users").status_code == 503
+
+
+def test_pass_through_when_redis_is_down(client, app, fake):
+    fake.down = True
+    assert client.get("/users").json() == {"calls": 1}
+    assert client.get("/users").json() == {"calls": 2}
+    assert client.post("/users").status_code == 200
+
+
+def test_conditional_requests_bypass_cache(client, app):
+    client.get("/users")
+    client.get("/users", headers={"If-None-Match": '"x"'})
+    assert app.state.calls == 2
@@ -1,52 +1,35 @@
-import requests
+import asyncio
 import pytest
 import time
 
-BASE_URL = "http://localhost:8000"
+from api_client import create_fixture_user, make_client
 
-@pytest.fixture(scope="module")
-def user_id():
-    user_data = {
-        "name": "Test User",
-        "email": "test@example.com",
-        "age": 25,
-        "is_active": True,
-    }
-    response = requests.post(
-        f"{BASE_URL}/users",
-        json=user_data,
-        headers={"Content-Type": "application/json"},
-    )
-    assert response.status_code == 201
-    data = response.json()
-    yield data["id"]
-    # Teardown: delete the user after tests
-    requests.delete(f"{BASE_URL}/users/{data['id']}")
+pytestmark = pytest.mark.anyio
 
 
-def test_health_check():
-    response = requests.get(f"{BASE_URL}/health")
+async def test_health_check(client):
+    response = await client.get("/health")
     assert response.status_code == 200
     data = response.json()
     print(f"✅ Health check passed: {data['status']}")
 
 
-def test_root_endpoint():
-    response = requests.get(f"{BASE_URL}/")
+async def test_root_endpoint(client):
+    response = await client.get("/")
     assert response.status_code == 200
     data = response.json()
     print(f"✅ Root endpoint: {data['message']}")
 
 
-def test_create_user():
+async def test_create_user(client):
     user_data = {
         "name": "Test User 2",
         "email": "test2@example.com",
         "age": 28,
         "is_active": True,
     }
-    response = requests.post(
-        f"{BASE_URL}/users",
+    response = await client.post(
+        "/users",
         json=user_data,
         headers={"Content-Type": "application/json"},
     )
@@ -55,32 +38,32 @@ def test_create_user():
     assert data["name"] == user_data["name"]
     print(f"✅ User created: ID {data['id']}, Name: {data['name']}")
     # Cleanup
-    requests.delete(f"{BASE_URL}/users/{data['id']}")
+    await client.delete(f"/users/{data['id']}")
 
 
-def test_get_users():
-    response = requests.get(f"{BASE_URL}/users")
+async def test_get_users(client):
+    response = await client.get("/users")
     assert response.status_code == 200
     users = response.json()
     print(f"✅ Retrieved {len(users)} users")
 
 
-def test_get_user(user_id):
-    response = requests.get(f"{BASE_URL}/users/{user_id}")
+async def test_get_user(client, user_id):
+    response = await client.get(f"/users/{user_id}")
     assert response.status_code == 200
     user = response.json()
     print(f"✅ Retrieved user: {user['name']} (ID: {user['id']})")
 
 
-def test_update_user(user_id):
+async def test_update_user(client, user_id):
     update_data = {
         "name": "Updated Test User",
         "email": "updated@example.com",
         "age": 30,
         "is_active": True,
     }
-    response = requests.put(
-        f"{BASE_URL}/users/{user_id}",
+    response = await client.put(
+        f"/users/{user_id}",
         json=update_data,
         headers={"Content-Type": "application/json"},
     )
@@ -90,8 +73,8 @@ def test_update_user(user_id):
     print(f"✅ User updated: {data['name']}")
 
 
-def test_analytics():
-    response = requests.get(f"{BASE_URL}/analytics")
+async def test_analytics(client):
+    response = await client.get("/analytics")
     assert response.status_code == 200
     data = response.json()
     print(
@@ -99,7 +82,29 @@ def test_analytics():
     )
 
 
-def test_delete_user(user_id):
-    response = requests.delete(f"{BASE_URL}/users/{user_id}")
+async def test_delete_user(client, user_id):
+    response = await client.delete(f"/users/{user_id}")
     assert response.status_code == 204
-    print(f"✅ User {user_id} deleted successfully") 
\ No newline at end of file
+    print(f"✅ User {user_id} deleted successfully")
+
+
+async def run_all_tests():
+    """Run the suite without pytest, firing independent endpoints concurrently"""
+    start = time.perf_counter()
+    async with make_client() as c:
+        await asyncio.gather(
+            test_health_check(c),
+            test_root_endpoint(c),
+            test_get_users(c),
+            test_analytics(c),
+            test_create_user(c),
+        )
+        # Only the fixture user's lifecycle needs ordering
+        uid = await create_fixture_user(c)
+        await asyncio.gather(test_get_user(c, uid), test_update_user(c, uid))
+        await test_delete_user(c, uid)
+    print(f"🎉 All tests passed in {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_all_tests())
@@ -0,0 +1,136 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import web_server
+
+client = TestClient(web_server.app)
+
+
+def make_user(email):
+    return {"name": "Bulk User", "email": email, "age": 30, "is_active": True}
+
+
+def test_bulk_create_and_delete():
+    response = client.post(
+        "/users:bulk",
+        json=[make_user("bulk1@example.com"), make_user("bulk2@example.com")],
+    )
+    assert response.status_code == 201
+    ids = [user["id"] for user in response.json()]
+    assert len(ids) == 2
+
+    response = client.post("/users:bulk-delete", json=ids)
+    assert response.status_code == 204
+    for user_id in ids:
+        assert client.get(f"/users/{user_id}").status_code == 404
+
+
+def test_bulk_create_duplicate_email_inserts_nothing():
+    before = client.get("/analytics").json()["total_users"]
+    response = client.post(
+        "/users:bulk",
+        json=[make_user("dup@example.com"), make_user("dup@example.com")],
+    )
+    assert response.status_code == 400
+    assert client.get("/analytics").json()["total_users"] == before
+    # The email was not claimed by the rejected batch
+    assert client.post("/users", json=make_user("dup@example.com")).status_code == 201
+
+
+def test_bulk_delete_unknown_id_deletes_nothing():
+    response = client.post("/users", json=make_user("keep@example.com"))
+    user_id = response.json()["id"]
+
+    response = client.post("/users:bulk-delete", json=[user_id, 999999])
+    assert response.status_code == 404
+    assert client.get(f"/users/{user_id}").status_code == 200
+
+
+@pytest.mark.parametrize("path", ["/users:bulk", "/users:bulk-delete"])
+def test_bulk_size_limit(monkeypatch, path):
+    monkeypatch.setattr(web_server, "MAX_BULK_SIZE", 2)
+    if path == "/users:bulk":
+        payload = [make_user(f"limit{i}@example.com") for i in range(3)]
+    else:
+        payload = [1, 2, 3]
+    response = client.post(path, json=payload)
+    assert response.status_code == 400
+
+
+def test_unchanged_update_returns_stored_record():
+    created = client.post("/users", json=make_user("same@example.com")).json()
+    analytics = client.get("/analytics").json()
+    emails = dict(web_server.emails_db)
+
+    response = client.put(f"/users/{created['id']}", json=make_user("same@example.com"))
+    assert response.status_code == 200
+    assert response.json() == created
+
+    after = client.get("/analytics").json()
+    assert after["total_users"] == analytics["total_users"]
+    assert after["active_users"] == analytics["active_users"]
+    assert web_server.emails_db == emails
+
+
+def test_malformed_email_rejected():
+    assert client.post("/users", json=make_user("not-an-email")).status_code == 422
+    user_id = client.post("/users", json=make_user("valid@example.com")).json()["id"]
+    response = client.put(f"/users/{user_id}", json=make_user("also@bad"))
+    assert response.status_code == 422
+
+
+def test_email_index_follows_writes():
+    user_id = client.post("/users", json=make_user("first@example.com")).json()["id"]
+    other = make_user("taken@example.com")
+    assert client.post("/users", json=other).status_code == 201
+    assert client.post("/users", json=other).status_code == 400
+
+    # Changing to a taken email is rejected and keeps the old one indexed
+    response = client.put(f"/users/{user_id}", json=make_user("taken@example.com"))
+    assert response.status_code == 400
+    assert web_server.emails_db["first@example.com"] == user_id
+
+    # Changing email frees the old one
+    response = client.put(f"/users/{user_id}", json=make_user("second@example.com"))
+    assert response.status_code == 200
+    assert "first@example.com" not in web_server.emails_db
+    assert client.post("/users", json=make_user("first@example.com")).status_code == 201
+
+    # Deleting frees the current one
+    assert client.delete(f"/users/{user_id}").status_code == 204
+    response = client.post("/users", json=make_user("second@example.com"))
+    assert response.status_code == 201
+    assert web_server.emails_db == {
+        user.email: user.id for user in web_server.users_db.values()
+    }
+
+
+def expected_analytics():
+    active = sum(user.is_active for user in web_server.users_db.values())
+    total = len(web_server.users_db)
+    return total, active, total - active
+
+
+def analytics_counts():
+    data = client.get("/analytics").json()
+    return data["total_users"], data["active_users"], data["inactive_users"]
+
+
+def test_active_count_follows_writes():
+    inactive = {**make_user("counted@example.com"), "is_active": False}
+    user_id = client.post("/users", json=inactive).json()["id"]
+    assert analytics_counts() == expected_analytics()
+
+    client.put(f"/users/{user_id}", json=make_user("counted@example.com"))
+    assert analytics_counts() == expected_analytics()
+
+    batch = [
+        make_user("count1@example.com"),
+        {**make_user("count2@example.com"), "is_active": False},
+    ]
+    ids = [user["id"] for user in client.post("/users:bulk", json=batch).json()]
+    assert analytics_counts() == expected_analytics()
+
+    client.post("/users:bulk-delete", json=ids)
+    client.delete(f"/users/{user_id}")
+    assert analytics_counts() == expected_analytics()
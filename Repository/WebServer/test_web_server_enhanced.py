@@ -0,0 +1,37 @@
+from fastapi.testclient import TestClient
+
+import web_server_enhanced
+
+client = TestClient(web_server_enhanced.app)
+
+
+def test_conditional_get():
+    response = client.post(
+        "/users", json={"name": "ETag User", "email": "etag@example.com"}
+    )
+    user_id = response.json()["id"]
+    update_data = {"name": "ETag User", "email": "etag@example.com", "age": 30}
+
+    for path in ("/users", f"/users/{user_id}", "/analytics"):
+        response = client.get(path)
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+
+        for if_none_match in (etag, f'"other", {etag}', "*"):
+            response = client.get(path, headers={"If-None-Match": if_none_match})
+            assert response.status_code == 304
+
+        # A write changes the ETag, so the old one no longer matches
+        client.put(f"/users/{user_id}", json=update_data)
+        response = client.get(path, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+
+
+def test_openapi_and_docs_without_lifespan():
+    # The module-level client never runs lifespan, so the schema is encoded
+    # on first request
+    response = client.get("/openapi.json")
+    assert response.status_code == 200
+    assert "/users" in response.json()["paths"]
+    assert client.get("/docs").status_code == 200
+    assert client.get("/redoc").status_code == 200
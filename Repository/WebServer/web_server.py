@@ -1,12 +1,18 @@
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Query, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel, EmailStr, Field
 from typing import List, Optional, Dict, Any
+import orjson
 import uvicorn
 import logging
-from datetime import datetime
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import count, islice
 import os
+import time
 from contextlib import asynccontextmanager
 
 # Configure logging
@@ -20,7 +26,7 @@ class User(BaseModel):
     name: str = Field(
         ..., min_length=1, max_length=100, description="User's full name"
     )
-    email: str = Field(..., description="User's email address")
+    email: EmailStr = Field(..., description="User's email address")
     age: Optional[int] = Field(None, ge=0, le=150, description="User's age")
     is_active: bool = Field(True, description="Whether the user is active")
 
@@ -41,9 +47,25 @@ class HealthCheck(BaseModel):
     uptime: float
 
 
+# Stored user record; a slotted dataclass is much lighter than a model
+@dataclass(slots=True)
+class UserRecord:
+    id: int
+    name: str
+    email: str
+    age: Optional[int]
+    is_active: bool
+    created_at: datetime
+
+
 # In-memory storage (replace with database in production)
-users_db: Dict[int, User] = {}
-user_counter = 1
+users_db: Dict[int, UserRecord] = {}
+emails_db: Dict[str, int] = {}  # email -> user ID, for O(1) uniqueness checks
+next_user_id = count(1).__next__  # hands out user IDs 1, 2, 3, ...
+active_count = 0  # number of users with is_active set, kept for /analytics
+
+# Upper bound on the number of users accepted by a single bulk request
+MAX_BULK_SIZE = int(os.getenv("MAX_BULK_SIZE", 1000))
 
 
 # Startup and shutdown events
@@ -63,6 +85,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan,
 )
 
@@ -75,6 +98,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress list-sized responses. Bodies under 1 KB (root, health, single
+# users) gain little from gzip, and level 5 gets close to level 9's ratio on
+# JSON for much less CPU per response.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 
 # Dependency for getting current user (placeholder for authentication)
 async def get_current_user():
@@ -82,26 +110,39 @@ async def get_current_user():
     return {"user_id": "demo_user"}
 
 
-# Root endpoint
-@app.get("/", response_model=Dict[str, str])
-async def root():
-    """Root endpoint returning welcome message"""
-    return {
+# Fixed-shape root and health bodies, built without the per-request JSON
+# encoder; the response_model on those routes is kept for the OpenAPI docs
+ROOT_BODY = orjson.dumps(
+    {
         "message": "Welcome to LPL-MCP Web Server!",
         "docs": "/docs",
         "health": "/health",
     }
+)
+HEALTH_BODY_TEMPLATE = (
+    '{{"status":"healthy","timestamp":"{}","version":"1.0.0","uptime":{}}}'
+)
+
+# Reference point for /health uptime
+SERVER_START = time.monotonic()
+
+
+# Root endpoint
+@app.get("/", response_model=Dict[str, str])
+async def root():
+    """Root endpoint returning welcome message"""
+    return Response(content=ROOT_BODY, media_type="application/json")
 
 
 # Health check endpoint
 @app.get("/health", response_model=HealthCheck)
 async def health_check():
     """Health check endpoint for monitoring"""
-    return HealthCheck(
-        status="healthy",
-        timestamp=datetime.utcnow(),
-        version="1.0.0",
-        uptime=0.0,  # You could track actual uptime here
+    return Response(
+        content=HEALTH_BODY_TEMPLATE.format(
+            datetime.utcnow().isoformat(), time.monotonic() - SERVER_START
+        ),
+        media_type="application/json",
     )
 
 
@@ -111,24 +152,18 @@ async def health_check():
 )
 async def create_user(user: User):
     """Create a new user"""
-    global user_counter
+    global active_count
 
     # Check if email already exists
-    for existing_user in users_db.values():
-        if existing_user.email == user.email:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already registered",
-            )
+    if user.email in emails_db:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered",
+        )
 
     # Create new user
-    user.id = user_counter
-    user_counter += 1
-    users_db[user.id] = user
-
-    logger.info(f"Created user with ID: {user.id}")
-
-    return UserResponse(
+    user.id = next_user_id()
+    users_db[user.id] = UserRecord(
         id=user.id,
         name=user.name,
         email=user.email,
@@ -136,27 +171,22 @@ async def create_user(user: User):
         is_active=user.is_active,
         created_at=datetime.utcnow(),
     )
+    emails_db[user.email] = user.id
+    if user.is_active:
+        active_count += 1
+
+    logger.debug("Created user with ID: %s", user.id)
+
+    return users_db[user.id]
 
 
 @app.get("/users", response_model=List[UserResponse])
 async def get_users(
-    skip: int = 0,
-    limit: int = 100,
-    current_user: Dict[str, str] = Depends(get_current_user),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
 ):
     """Get all users with pagination"""
-    users = list(users_db.values())[skip : skip + limit]
-    return [
-        UserResponse(
-            id=user.id,
-            name=user.name,
-            email=user.email,
-            age=user.age,
-            is_active=user.is_active,
-            created_at=datetime.utcnow(),
-        )
-        for user in users
-    ]
+    return list(islice(users_db.values(), skip, skip + limit))
 
 
 @app.get("/users/{user_id}", response_model=UserResponse)
@@ -167,63 +197,142 @@ async def get_user(user_id: int):
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
         )
 
-    user = users_db[user_id]
-    return UserResponse(
-        id=user.id,
-        name=user.name,
-        email=user.email,
-        age=user.age,
-        is_active=user.is_active,
-        created_at=datetime.utcnow(),
-    )
+    return users_db[user_id]
 
 
 @app.put("/users/{user_id}", response_model=UserResponse)
 async def update_user(user_id: int, user_update: User):
     """Update a user by ID"""
+    global active_count
     if user_id not in users_db:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
         )
 
+    # Unchanged record (e.g. a retried PUT): nothing to write
+    existing_user = users_db[user_id]
+    if (
+        user_update.name == existing_user.name
+        and user_update.email == existing_user.email
+        and user_update.age == existing_user.age
+        and user_update.is_active == existing_user.is_active
+    ):
+        return existing_user
+
     # Check if email is being changed and if it conflicts
-    if user_update.email != users_db[user_id].email:
-        for existing_user in users_db.values():
-            if (
-                existing_user.id != user_id
-                and existing_user.email == user_update.email
-            ):
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Email already registered",
-                )
+    old_email = existing_user.email
+    if user_update.email != old_email:
+        if emails_db.get(user_update.email) not in (None, user_id):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Email already registered",
+            )
+        del emails_db[old_email]
+        emails_db[user_update.email] = user_id
 
     # Update user
+    active_count += user_update.is_active - existing_user.is_active
     user_update.id = user_id
-    users_db[user_id] = user_update
-
-    logger.info(f"Updated user with ID: {user_id}")
-
-    return UserResponse(
+    users_db[user_id] = UserRecord(
         id=user_update.id,
         name=user_update.name,
         email=user_update.email,
         age=user_update.age,
         is_active=user_update.is_active,
-        created_at=datetime.utcnow(),
+        created_at=existing_user.created_at,
     )
 
+    logger.debug("Updated user with ID: %s", user_id)
+
+    return users_db[user_id]
+
 
 @app.delete("/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_user(user_id: int):
     """Delete a user by ID"""
+    global active_count
     if user_id not in users_db:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
         )
 
-    del users_db[user_id]
-    logger.info(f"Deleted user with ID: {user_id}")
+    user = users_db.pop(user_id)
+    del emails_db[user.email]
+    if user.is_active:
+        active_count -= 1
+    logger.debug("Deleted user with ID: %s", user_id)
+
+
+# Bulk users endpoints
+def check_bulk_size(size: int):
+    if size > MAX_BULK_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Bulk requests are limited to {MAX_BULK_SIZE} users",
+        )
+
+
+@app.post(
+    "/users:bulk",
+    response_model=List[UserResponse],
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_users_bulk(users: List[User]):
+    """Create several users in one request"""
+    global active_count
+    check_bulk_size(len(users))
+
+    # Validate the whole batch before inserting anything
+    seen_emails = set()
+    for user in users:
+        if user.email in emails_db or user.email in seen_emails:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Email already registered: {user.email}",
+            )
+        seen_emails.add(user.email)
+
+    # Create new users
+    created_at = datetime.utcnow()
+    for user in users:
+        user.id = next_user_id()
+        users_db[user.id] = UserRecord(
+            id=user.id,
+            name=user.name,
+            email=user.email,
+            age=user.age,
+            is_active=user.is_active,
+            created_at=created_at,
+        )
+        emails_db[user.email] = user.id
+        if user.is_active:
+            active_count += 1
+
+    logger.debug("Created %s users in bulk", len(users))
+
+    return [users_db[user.id] for user in users]
+
+
+@app.post("/users:bulk-delete", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_users_bulk(user_ids: List[int]):
+    """Delete several users by ID in one request"""
+    global active_count
+    check_bulk_size(len(user_ids))
+
+    missing = [user_id for user_id in user_ids if user_id not in users_db]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Users not found: {missing}",
+        )
+
+    deleted_ids = set(user_ids)
+    for user_id in deleted_ids:
+        user = users_db.pop(user_id)
+        del emails_db[user.email]
+        if user.is_active:
+            active_count -= 1
+    logger.debug("Deleted %s users in bulk", len(deleted_ids))
 
 
 # Analytics endpoint
@@ -231,24 +340,35 @@ async def delete_user(user_id: int):
 async def get_analytics():
     """Get basic analytics about the system"""
     total_users = len(users_db)
-    active_users = sum(1 for user in users_db.values() if user.is_active)
 
     return {
         "total_users": total_users,
-        "active_users": active_users,
-        "inactive_users": total_users - active_users,
+        "active_users": active_count,
+        "inactive_users": total_users - active_count,
         "timestamp": datetime.utcnow(),
     }
 
 
 # Error handlers
+@lru_cache(maxsize=1)
+def format_error_timestamp(second: int) -> str:
+    return (
+        datetime.fromtimestamp(second, timezone.utc).replace(tzinfo=None).isoformat()
+    )
+
+
+def error_timestamp() -> str:
+    """Error timestamp, formatted at most once per second"""
+    return format_error_timestamp(int(time.time()))
+
+
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "detail": exc.detail,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": error_timestamp(),
         },
     )
 
@@ -256,11 +376,11 @@ async def http_exception_handler(request, exc):
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
     logger.error(f"Unhandled exception: {exc}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "detail": "Internal server error",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": error_timestamp(),
         },
     )
 
@@ -271,10 +391,24 @@ if __name__ == "__main__":
     host = os.getenv("HOST", "0.0.0.0")
 
     logger.info(f"Starting server on {host}:{port}")
-    uvicorn.run(
-        "web_server:app",
-        host=host,
-        port=port,
-        reload=True,  # Enable auto-reload for development
-        log_level="info",
-    )
+    if os.getenv("ENV") == "prod":
+        # uvloop event loop and httptools parser, without the reloader.
+        # users_db lives in each worker process, so keep WORKERS=1 until the
+        # user store moves out of process.
+        uvicorn.run(
+            "web_server:app",
+            host=host,
+            port=port,
+            workers=int(os.getenv("WORKERS", 1)),
+            loop="uvloop",
+            http="httptools",
+            log_level=os.getenv("LOG_LEVEL", "warning"),
+        )
+    else:
+        uvicorn.run(
+            "web_server:app",
+            host=host,
+            port=port,
+            reload=True,  # Enable auto-reload for development
+            log_level=os.getenv("LOG_LEVEL", "info"),
+        )
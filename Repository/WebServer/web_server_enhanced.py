@@ -1,14 +1,26 @@
-from fastapi import FastAPI, HTTPException, Depends, status, Query, Path, Body
+from fastapi import FastAPI, HTTPException, Request, status, Query, Path, Body
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
+from fastapi.openapi.docs import (
+    get_redoc_html,
+    get_swagger_ui_html,
+    get_swagger_ui_oauth2_redirect_html,
+)
 from fastapi.openapi.utils import get_openapi
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
+import msgspec
+import orjson
 import uvicorn
 import logging
 from datetime import datetime
+from itertools import islice
 import os
+import time
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from uuid import uuid4
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -45,6 +57,9 @@ class User(BaseModel):
     }
 
 
+# Response models are filled from server-generated or already validated
+# data, so handlers build them with model_construct() to skip re-validation.
+# They are frozen and reject unknown fields, since nothing mutates them.
 class UserResponse(BaseModel):
     id: int = Field(..., description="Unique user identifier")
     name: str = Field(..., description="User's full name")
@@ -65,7 +80,9 @@ class UserResponse(BaseModel):
                     "created_at": "2024-01-01T12:00:00",
                 }
             ]
-        }
+        },
+        "frozen": True,
+        "extra": "forbid",
     }
 
 
@@ -85,7 +102,9 @@ class HealthCheck(BaseModel):
                     "uptime": 3600.0,
                 }
             ]
-        }
+        },
+        "frozen": True,
+        "extra": "forbid",
     }
 
 
@@ -105,13 +124,82 @@ class AnalyticsResponse(BaseModel):
                     "timestamp": "2024-01-01T12:00:00",
                 }
             ]
-        }
+        },
+        "frozen": True,
+        "extra": "forbid",
     }
 
 
+# msgspec mirror of UserResponse for the list endpoint, which encodes
+# straight to JSON bytes without going through pydantic
+class UserResponseMsg(msgspec.Struct):
+    id: int
+    name: str
+    email: str
+    age: Optional[int]
+    is_active: bool
+    created_at: datetime
+
+
+user_list_encoder = msgspec.json.Encoder()
+
+
+# Stored user record; a slotted dataclass avoids a pydantic model per user
+@dataclass(slots=True)
+class UserRecord:
+    id: int
+    name: str
+    email: str
+    age: Optional[int]
+    is_active: bool
+    created_at: datetime
+
+
 # In-memory storage (replace with database in production)
-users_db: Dict[int, User] = {}
+users_db: Dict[int, UserRecord] = {}
+emails_index: Dict[str, int] = {}  # email -> user ID, for O(1) uniqueness checks
+active_count: int = 0  # number of users with is_active set, kept for analytics
 user_counter = 1
+users_generation = 0  # bumped on every user write; used as the ETag for user data
+# Per-process token in user-data ETags, so tags issued before a restart (when
+# users_generation starts over from 0) can never match
+BOOT_ID = uuid4().hex[:8]
+
+# Optional Redis response cache for read-only endpoints, enabled by REDIS_URL.
+# redis is only imported when the cache is in use.
+REDIS_URL = os.getenv("REDIS_URL")
+redis_client = None
+if REDIS_URL:
+    from redis.asyncio import Redis
+    from redis_cache import RedisCacheMiddleware, bump_generation
+
+    redis_client = Redis.from_url(REDIS_URL)
+
+# Wall-clock time re-read at most every CLOCK_REFRESH_INTERVAL seconds, for
+# timestamps that may be slightly stale (health, analytics, error bodies)
+CLOCK_REFRESH_INTERVAL = 0.1
+clock_read_at = float("-inf")  # time.monotonic() of the last refresh
+cached_now = datetime.utcnow()
+cached_now_iso = cached_now.isoformat()
+
+
+def refresh_clock():
+    global clock_read_at, cached_now, cached_now_iso
+    now = time.monotonic()
+    if now - clock_read_at > CLOCK_REFRESH_INTERVAL:
+        clock_read_at = now
+        cached_now = datetime.utcnow()
+        cached_now_iso = cached_now.isoformat()
+
+
+def current_time() -> datetime:
+    refresh_clock()
+    return cached_now
+
+
+def current_time_iso() -> str:
+    refresh_clock()
+    return cached_now_iso
 
 
 # Startup and shutdown events
@@ -119,9 +207,17 @@ user_counter = 1
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting up LPL-MCP FastAPI Web Server...")
+    # Build and encode the OpenAPI schema before accepting traffic; it is
+    # cached on first use, so this only moves that work off the request path
+    encoded_openapi()
+    # users_db starts empty, so entries cached by an earlier process are stale
+    if redis_client is not None:
+        await bump_generation(redis_client)
     yield
     # Shutdown
     logger.info("Shutting down LPL-MCP FastAPI Web Server...")
+    if redis_client is not None:
+        await redis_client.aclose()
 
 
 # Create FastAPI app instance with enhanced configuration
@@ -155,8 +251,11 @@ app = FastAPI(
     - Comprehensive error handling
     """,
     version="1.0.0",
-    docs_url="/docs",
-    redoc_url="/redoc",
+    # The schema and docs routes are registered below, see openapi_json()
+    openapi_url=None,
+    docs_url=None,
+    redoc_url=None,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan,
     contact={
         "name": "LPL-MCP Team",
@@ -168,6 +267,10 @@ app = FastAPI(
     },
 )
 
+# Added before CORS so CORS headers are applied per request, not cached
+if redis_client is not None:
+    app.add_middleware(RedisCacheMiddleware, client=redis_client)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -177,6 +280,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress list-sized responses. Bodies under 1 KB (root, health, single
+# users) gain little from gzip, and level 5 gets close to level 9's ratio on
+# JSON for much less CPU per response.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 
 # Custom OpenAPI schema for better SwaggerHub integration
 def custom_openapi():
@@ -220,6 +328,43 @@ def custom_openapi():
 
 app.openapi = custom_openapi
 
+# FastAPI's built-in /openapi.json route re-encodes the schema on every
+# request, so the app is created without it and these routes serve the schema
+# as bytes encoded once, plus the docs pages that load it
+OPENAPI_URL = "/openapi.json"
+openapi_bytes: Optional[bytes] = None
+
+
+def encoded_openapi() -> bytes:
+    """OpenAPI schema as JSON, encoded on first use"""
+    global openapi_bytes
+    if openapi_bytes is None:
+        openapi_bytes = orjson.dumps(app.openapi())
+    return openapi_bytes
+
+
+@app.get(OPENAPI_URL, include_in_schema=False)
+async def openapi_json():
+    return Response(content=encoded_openapi(), media_type="application/json")
+
+
+@app.get("/docs", include_in_schema=False)
+async def swagger_ui_html():
+    return get_swagger_ui_html(
+        openapi_url=OPENAPI_URL,
+        title=f"{app.title} - Swagger UI",
+        oauth2_redirect_url="/docs/oauth2-redirect",
+    )
+
+
+@app.get("/docs/oauth2-redirect", include_in_schema=False)
+async def swagger_ui_redirect():
+    return get_swagger_ui_oauth2_redirect_html()
+
+
+@app.get("/redoc", include_in_schema=False)
+async def redoc_html():
+    return get_redoc_html(openapi_url=OPENAPI_URL, title=f"{app.title} - ReDoc")
 
 # Dependency for getting current user (placeholder for authentication)
 async def get_current_user():
@@ -227,6 +372,43 @@ async def get_current_user():
     return {"user_id": "demo_user"}
 
 
+# HTTP conditional GET support for polled read endpoints
+CACHE_CONTROL = "max-age=5, stale-while-revalidate=30"
+
+
+def etag_headers(etag: str) -> Dict[str, str]:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """Return a 304 response if the client's cached copy is still current"""
+    header = request.headers.get("if-none-match")
+    if header is None:
+        return None
+    # A comma-separated list of tags or "*", compared weakly (RFC 9110)
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    if "*" in tags or etag.removeprefix("W/") in tags:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag)
+        )
+    return None
+
+
+# Fixed-shape root and health bodies, built without the per-request JSON
+# encoder; the response models on those routes are kept for the OpenAPI docs
+ROOT_BODY = orjson.dumps(
+    {
+        "message": "Welcome to LPL-MCP Web Server!",
+        "docs": "/docs",
+        "health": "/health",
+        "version": "1.0.0",
+    }
+)
+HEALTH_BODY_TEMPLATE = (
+    '{{"status":"healthy","timestamp":"{}","version":"1.0.0","uptime":0.0}}'
+)
+
+
 # Root endpoint
 @app.get(
     "/",
@@ -238,18 +420,13 @@ async def get_current_user():
 )
 async def root():
     """Root endpoint returning welcome message and API information"""
-    return {
-        "message": "Welcome to LPL-MCP Web Server!",
-        "docs": "/docs",
-        "health": "/health",
-        "version": "1.0.0",
-    }
+    return Response(content=ROOT_BODY, media_type="application/json")
 
 
 # Health check endpoint
 @app.get(
     "/health",
-    response_model=HealthCheck,
+    response_model=None,
     tags=["health"],
     summary="Health Check",
     description="Check system health and operational status",
@@ -257,6 +434,7 @@ async def root():
     responses={
         200: {
             "description": "System is healthy",
+            "model": HealthCheck,
             "content": {
                 "application/json": {
                     "example": {
@@ -270,20 +448,25 @@ async def root():
         }
     },
 )
-async def health_check():
+async def health_check(request: Request):
     """Health check endpoint for monitoring and load balancers"""
-    return HealthCheck(
-        status="healthy",
-        timestamp=datetime.utcnow(),
-        version="1.0.0",
-        uptime=0.0,  # You could track actual uptime here
+    etag = f'W/"{int(time.time()) // 5}"'
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    # Uptime is not tracked yet, so it is fixed at 0.0 in the template
+    return Response(
+        content=HEALTH_BODY_TEMPLATE.format(current_time_iso()),
+        media_type="application/json",
+        headers=etag_headers(etag),
     )
 
 
 # Users endpoints
 @app.post(
     "/users",
-    response_model=UserResponse,
+    response_model=None,
     status_code=status.HTTP_201_CREATED,
     tags=["users"],
     summary="Create User",
@@ -304,6 +487,7 @@ async def health_check():
     responses={
         201: {
             "description": "User created successfully",
+            "model": UserResponse,
             "content": {
                 "application/json": {
                     "example": {
@@ -332,36 +516,46 @@ async def health_check():
 )
 async def create_user(user: User):
     """Create a new user account"""
-    global user_counter
+    global user_counter, active_count, users_generation
 
     # Check if email already exists
-    for existing_user in users_db.values():
-        if existing_user.email == user.email:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already registered",
-            )
+    if user.email in emails_index:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered",
+        )
 
     # Create new user
-    user.id = user_counter
-    user_counter += 1
-    users_db[user.id] = user
-
-    logger.info(f"Created user with ID: {user.id}")
-
-    return UserResponse(
-        id=user_counter - 1,  # Use the assigned ID
+    record = UserRecord(
+        id=user_counter,
         name=user.name,
         email=user.email,
         age=user.age,
         is_active=user.is_active,
         created_at=datetime.utcnow(),
     )
+    user_counter += 1
+    users_db[record.id] = record
+    emails_index[record.email] = record.id
+    if record.is_active:
+        active_count += 1
+    users_generation += 1
+
+    logger.info(f"Created user with ID: {record.id}")
+
+    return UserResponse.model_construct(
+        id=record.id,
+        name=record.name,
+        email=record.email,
+        age=record.age,
+        is_active=record.is_active,
+        created_at=record.created_at,
+    )
 
 
 @app.get(
     "/users",
-    response_model=List[UserResponse],
+    response_model=None,
     tags=["users"],
     summary="Get Users",
     description="""
@@ -377,6 +571,7 @@ async def create_user(user: User):
     responses={
         200: {
             "description": "List of users retrieved successfully",
+            "model": List[UserResponse],
             "content": {
                 "application/json": {
                     "example": [
@@ -395,30 +590,40 @@ async def create_user(user: User):
     },
 )
 async def get_users(
+    request: Request,
     skip: int = Query(0, ge=0, description="Number of users to skip"),
     limit: int = Query(
         100, ge=1, le=1000, description="Maximum number of users to return"
     ),
-    current_user: Dict[str, str] = Depends(get_current_user),
 ):
     """Get all users with pagination support"""
-    users = list(users_db.values())[skip : skip + limit]
-    return [
-        UserResponse(
-            id=user.id if user.id is not None else -1,
-            name=user.name,
-            email=user.email,
-            age=user.age,
-            is_active=user.is_active,
-            created_at=datetime.utcnow(),
-        )
-        for user in users
-    ]
+    etag = f'W/"{BOOT_ID}-{users_generation}"'
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    users = islice(users_db.values(), skip, skip + limit)
+    body = user_list_encoder.encode(
+        [
+            UserResponseMsg(
+                id=user.id,
+                name=user.name,
+                email=user.email,
+                age=user.age,
+                is_active=user.is_active,
+                created_at=user.created_at,
+            )
+            for user in users
+        ]
+    )
+    return Response(
+        content=body, media_type="application/json", headers=etag_headers(etag)
+    )
 
 
 @app.get(
     "/users/{user_id}",
-    response_model=UserResponse,
+    response_model=None,
     tags=["users"],
     summary="Get User by ID",
     description="Retrieve a specific user by their unique ID",
@@ -426,6 +631,7 @@ async def get_users(
     responses={
         200: {
             "description": "User found successfully",
+            "model": UserResponse,
             "content": {
                 "application/json": {
                     "example": {
@@ -453,7 +659,9 @@ async def get_users(
     },
 )
 async def get_user(
-    user_id: int = Path(..., gt=0, description="Unique user identifier")
+    request: Request,
+    response: Response,
+    user_id: int = Path(..., gt=0, description="Unique user identifier"),
 ):
     """Get a specific user by ID"""
     if user_id not in users_db:
@@ -461,20 +669,26 @@ async def get_user(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
         )
 
+    etag = f'W/"{BOOT_ID}-{users_generation}"'
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    response.headers.update(etag_headers(etag))
+
     user = users_db[user_id]
-    return UserResponse(
-        id=user.id if user.id is not None else -1,
+    return UserResponse.model_construct(
+        id=user.id,
         name=user.name,
         email=user.email,
         age=user.age,
         is_active=user.is_active,
-        created_at=datetime.utcnow(),
+        created_at=user.created_at,
     )
 
 
 @app.put(
     "/users/{user_id}",
-    response_model=UserResponse,
+    response_model=None,
     tags=["users"],
     summary="Update User",
     description="""
@@ -485,7 +699,10 @@ async def get_user(
     """,
     response_description="Updated user information",
     responses={
-        200: {"description": "User updated successfully"},
+        200: {
+            "description": "User updated successfully",
+            "model": UserResponse,
+        },
         400: {"description": "Bad request - email already exists"},
         404: {"description": "User not found"},
     },
@@ -495,36 +712,41 @@ async def update_user(
     user_update: User = Body(..., description="Updated user information"),
 ):
     """Update a user by ID"""
+    global active_count, users_generation
     if user_id not in users_db:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
         )
 
     # Check if email is being changed and if it conflicts
-    if user_update.email != users_db[user_id].email:
-        for existing_user in users_db.values():
-            if (
-                existing_user.id != user_id
-                and existing_user.email == user_update.email
-            ):
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Email already registered",
-                )
+    existing_user = users_db[user_id]
+    if user_update.email != existing_user.email:
+        other = emails_index.get(user_update.email)
+        if other is not None and other != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Email already registered",
+            )
+        emails_index.pop(existing_user.email, None)
+        emails_index[user_update.email] = user_id
 
     # Update user
-    user_update.id = user_id
-    users_db[user_id] = user_update
+    active_count += user_update.is_active - existing_user.is_active
+    users_generation += 1
+    existing_user.name = user_update.name
+    existing_user.email = user_update.email
+    existing_user.age = user_update.age
+    existing_user.is_active = user_update.is_active
 
     logger.info(f"Updated user with ID: {user_id}")
 
-    return UserResponse(
-        id=user_id,  # Use the path parameter
-        name=user_update.name,
-        email=user_update.email,
-        age=user_update.age,
-        is_active=user_update.is_active,
-        created_at=datetime.utcnow(),
+    return UserResponse.model_construct(
+        id=user_id,
+        name=existing_user.name,
+        email=existing_user.email,
+        age=existing_user.age,
+        is_active=existing_user.is_active,
+        created_at=existing_user.created_at,
     )
 
 
@@ -544,19 +766,24 @@ async def delete_user(
     user_id: int = Path(..., gt=0, description="Unique user identifier")
 ):
     """Delete a user by ID"""
+    global active_count, users_generation
     if user_id not in users_db:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
         )
 
-    del users_db[user_id]
+    user = users_db.pop(user_id)
+    emails_index.pop(user.email, None)
+    if user.is_active:
+        active_count -= 1
+    users_generation += 1
     logger.info(f"Deleted user with ID: {user_id}")
 
 
 # Analytics endpoint
 @app.get(
     "/analytics",
-    response_model=AnalyticsResponse,
+    response_model=None,
     tags=["analytics"],
     summary="Get Analytics",
     description="""
@@ -568,6 +795,7 @@ async def delete_user(
     responses={
         200: {
             "description": "Analytics retrieved successfully",
+            "model": AnalyticsResponse,
             "content": {
                 "application/json": {
                     "example": {
@@ -581,27 +809,32 @@ async def delete_user(
         }
     },
 )
-async def get_analytics():
+async def get_analytics(request: Request, response: Response):
     """Get basic analytics about the system"""
+    etag = f'W/"{BOOT_ID}-{users_generation}"'
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    response.headers.update(etag_headers(etag))
+
     total_users = len(users_db)
-    active_users = sum(1 for user in users_db.values() if user.is_active)
 
-    return AnalyticsResponse(
+    return AnalyticsResponse.model_construct(
         total_users=total_users,
-        active_users=active_users,
-        inactive_users=total_users - active_users,
-        timestamp=datetime.utcnow(),
+        active_users=active_count,
+        inactive_users=total_users - active_count,
+        timestamp=current_time(),
     )
 
 
 # Error handlers
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "detail": exc.detail,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": current_time_iso(),
         },
     )
 
@@ -609,11 +842,11 @@ async def http_exception_handler(request, exc):
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
     logger.error(f"Unhandled exception: {exc}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "detail": "Internal server error",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": current_time_iso(),
         },
     )
 
@@ -627,10 +860,24 @@ if __name__ == "__main__":
     logger.info(f"API Documentation: http://{host}:{port}/docs")
     logger.info(f"Health Check: http://{host}:{port}/health")
 
-    uvicorn.run(
-        "web_server_enhanced:app",
-        host=host,
-        port=port,
-        reload=True,  # Enable auto-reload for development
-        log_level="info",
-    )
+    if os.getenv("ENV") == "prod":
+        # uvloop event loop and httptools parser, without the reloader.
+        # users_db lives in each worker process, so keep WORKERS=1 until the
+        # user store moves out of process (e.g. to Redis).
+        uvicorn.run(
+            "web_server_enhanced:app",
+            host=host,
+            port=port,
+            workers=int(os.getenv("WORKERS", 1)),
+            loop="uvloop",
+            http="httptools",
+            log_level=os.getenv("LOG_LEVEL", "warning"),
+        )
+    else:
+        uvicorn.run(
+            "web_server_enhanced:app",
+            host=host,
+            port=port,
+            reload=True,  # Enable auto-reload for development
+            log_level=os.getenv("LOG_LEVEL", "info"),
+        )
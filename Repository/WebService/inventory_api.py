@@ -1,8 +1,9 @@
 from fastapi import FastAPI, HTTPException, Query, Path
 from pydantic import BaseModel, Field, EmailStr
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import uuid4, UUID
 from datetime import datetime
+from itertools import islice
 
 app = FastAPI(title="Simple Inventory API", version="1.0.0", description="This is a simple API")
 
@@ -23,47 +24,55 @@ class User(BaseModel):
     email: EmailStr = Field(..., example="johndoe@example.com")
 
 # In-memory storage
-inventory_db: List[InventoryItem] = []
-users_db: List[User] = []
+inventory_db: Dict[UUID, InventoryItem] = {}
+inventory_names_lower: Dict[UUID, str] = {}  # item id -> lowercased name, for search
+users_db: Dict[str, User] = {}  # keyed by username
+users_by_email: Dict[str, User] = {}
 
 # Inventory endpoints
 @app.get("/inventory", response_model=List[InventoryItem], tags=["developers"])
-def search_inventory(searchString: Optional[str] = Query(None), skip: int = 0, limit: int = 50):
-    results = inventory_db
+async def search_inventory(searchString: Optional[str] = Query(None), skip: int = Query(0, ge=0), limit: int = Query(50, ge=0, le=50)):
+    results = inventory_db.values()
     if searchString:
-        results = [item for item in results if searchString.lower() in item.name.lower()]
-    return results[skip:skip+limit]
+        needle = searchString.lower()
+        results = (inventory_db[item_id] for item_id, name in inventory_names_lower.items() if needle in name)
+    return list(islice(results, skip, skip + limit))
 
 @app.post("/inventory", status_code=201, tags=["admins"])
-def add_inventory(item: InventoryItem):
-    for inv in inventory_db:
-        if inv.id == item.id:
-            raise HTTPException(status_code=409, detail="An existing item already exists")
-    inventory_db.append(item)
+async def add_inventory(item: InventoryItem):
+    if item.id in inventory_db:
+        raise HTTPException(status_code=409, detail="An existing item already exists")
+    inventory_db[item.id] = item
+    inventory_names_lower[item.id] = item.name.lower()
     return {"message": "item created"}
 
 # User endpoints
 @app.post("/users", status_code=201, tags=["admins"])
-def add_user(user: User):
-    for u in users_db:
-        if u.email == user.email:
-            raise HTTPException(status_code=400, detail="Email already registered")
-    users_db.append(user)
+async def add_user(user: User):
+    if user.email in users_by_email:
+        raise HTTPException(status_code=400, detail="Email already registered")
+    if user.username in users_db:
+        raise HTTPException(status_code=400, detail="Username already registered")
+    users_db[user.username] = user
+    users_by_email[user.email] = user
     return {"message": f"Hello, {user.username}!", "user": user}
 
 @app.delete("/users", status_code=204, tags=["admins"])
-def delete_user(userId: str = Query(...)):
-    global users_db
-    users_db = [u for u in users_db if u.username != userId and u.email != userId]
+async def delete_user(userId: str = Query(...)):
+    # userId may be a username or an email, possibly of two different users
+    for user in (users_db.get(userId), users_by_email.get(userId)):
+        if user is not None:
+            users_db.pop(user.username, None)
+            users_by_email.pop(user.email, None)
     return
 
 @app.get("/users", response_model=List[User], tags=["admins"])
-def get_all_users():
-    return users_db
+async def get_all_users():
+    return list(users_db.values())
 
 @app.get("/users/{userId}", response_model=User, tags=["admins"])
-def get_user_info(userId: str = Path(...)):
-    for user in users_db:
-        if user.username == userId or user.email == userId:
-            return user
+async def get_user_info(userId: str = Path(...)):
+    user = users_db.get(userId) or users_by_email.get(userId)
+    if user is not None:
+        return user
     raise HTTPException(status_code=404, detail="User not found") 
\ No newline at end of file
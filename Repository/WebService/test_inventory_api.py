@@ -12,6 +12,11 @@ def test_add_user():
     assert response.status_code == 201
     assert response.json()["user"]["username"] == "alice"
 
+def test_add_user_duplicate_username():
+    client.post("/users", json={"username": "dave", "email": "dave@example.com"})
+    response = client.post("/users", json={"username": "dave", "email": "dave2@example.com"})
+    assert response.status_code == 400
+
 def test_get_all_users():
     response = client.get("/users")
     assert response.status_code == 200
@@ -37,6 +42,14 @@ def test_search_inventory():
     assert response.status_code == 200
     assert isinstance(response.json(), list)
 
+def test_search_inventory_rejects_negative_paging():
+    assert client.get("/inventory?skip=-1").status_code == 422
+    assert client.get("/inventory?limit=-1").status_code == 422
+    assert client.get("/inventory?limit=51").status_code == 422
+    response = client.get("/inventory?limit=0")
+    assert response.status_code == 200
+    assert response.json() == []
+
 def test_delete_user():
     # Add a user to delete
     user = {"username": "bob", "email": "bob@example.com"}